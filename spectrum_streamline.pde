@@ -7,39 +7,80 @@ AudioInput Beatin;
 BeatDetect beat;
 FFT fft;
 
-int tick =1;
 int g;
 int draw=0;
-float hn, ho, k;
 float update = 1;//was originally 0.1
 float updatec = 1;//was originally 0.1
+float silence = 0.00001;//peak level below which the input is treated as silent
 
-bar[]  bar= new bar[50];
-dot[]  dot= new dot[150];
 smoke[]  smoke= new smoke[150];
+//the bars are kept as parallel arrays, barho is the running height of each bar and bary the height last drawn
+int bary0=250;//the line the bars grow up from
+int barmax=200;//bars stop growing past this height
+int[] barx= new int[50];
+float[] barho= new float[50];
+float[] bary= new float[50];
+float[] scale= new float[50];
+color[] barColor= new color[50];
 float[] freq= {1,3,5,10,16,22,26,31,39,42,45,55,60,65,70,80,90,100,120,140,160,200,240,280,320,400,480,560,590,640,720,800,960,1024,1120,1280,1600,1920,2240,2560,3200,3340,3590,3720,3840,4480,5120,6400,7680,8960,10240,12800,15360,15360,15360,17800}; 
+//bin[] is the fft band for each entry in freq[], level[] holds this frame's value of that band
+int[] bin= new int[freq.length];
+float[] level= new float[freq.length];
+//the dots are kept as parallel arrays, one entry per dot, so their loop walks flat arrays
+//dotc is the dot's fill color with its transparency baked in
+int dots=100;
+float[] dotx= new float[dots];
+float[] doty= new float[dots];
+float[] dotdx= new float[dots];
+float[] dotdy= new float[dots];
+color[] dotc= new color[dots];
+//the dots are grouped by size, dotend[s] is the index just past the last dot of size s
+//a dot's size is set by the group its index falls in, so there is no per-dot size array
+int[] dotend= new int[4];
 
 void setup() {
   frameRate(240);
   minim = new Minim(this);
   Audin = minim.getLineIn(Minim.MONO, 4096);
   fft = new FFT(Audin.bufferSize(), Audin.sampleRate());
+  //the band index for each frequency only depends on the buffer size and sample rate
+  for(int i=0; i<freq.length; i++){bin[i]=fft.freqToIndex(freq[i]);}
   size(800, 300);
 
  for(int i=0; i<50; i++){
-   bar[i] = new bar((i*11)+(i*2)+100,200,800);
-   dot[i] = new dot();
-   dot[i+50] = new dot();
-   //dot[i+100] = new dot();
+   barx[i]=(i*11)+(i*2)+100;
+   scale[i]=15*((i/25.0)+0.8);
 
  }
-  // a beat detection object song SOUND_ENERGY mode with a sensitivity of 10 milliseconds
+ //count how many dots get each size, below 7 is size 1, below 11 size 2, otherwise size 3
+ for(int i=0; i<dots; i++){
+   float diam=(random(1,12));
+   dotend[1+int(diam>=7)+int(diam>=11)]++;
+ }
+ for(int s=1; s<4; s++){dotend[s]+=dotend[s-1];}
+ for(int i=0; i<dots; i++){newDot(i);}
+  // a beat detection object song SOUND_ENERGY mode with a sensitivity of 20 milliseconds
   beat = new BeatDetect();
+  //the sensitivity never changes so it is set once here instead of every frame
+  beat.setSensitivity(20);
+  barColors();
+}
+//fills barColor[] with the rainbow for the current updatec, call it again whenever updatec changes
+void barColors(){
+  for(int i=0; i<50; i++){
+    //the decimal is the spacing of theta between neighbouring bars
+    barColor[i]=color(abs(int(127*sin((updatec+(i*0.02)%6.28))+128)),abs(int(127*sin((updatec+((i*0.02)+2)%6.28))+128)),abs(int(127*sin((updatec+((i*0.02)+4)%6.28))+128)));
+  }
 }
 void draw() {
   
-  fft.forward(Audin.mix);
-  tick=1;
+  //one copy of the input per frame so the silence test, the fft and the beat detector all see the same samples
+  float[] samples = Audin.mix.toArray();
+  float peak = 0;
+  for(int i=0; i<samples.length; i++){peak = max(peak, abs(samples[i]));}
+  //when the input is silent skip the fft, the bars just fall back down
+  boolean silent = peak < silence;
+  if(!silent){fft.forward(samples);}
   /*
   //update and updatec are the rates of change of theta in the sine functions controlling the fill color
   update += 0.02;
@@ -48,29 +89,31 @@ void draw() {
   updatec = updatec%6.28;
   float ofst=0;*/
   int boom;
-      beat.setSensitivity(20);
-    beat.detect(Audin.mix);
+    beat.detect(samples);
     if ( beat.isOnset() ) {boom=10;}
     else{boom=0;}
-  if(tick==1){
       clear();
       float band =0;
       float bandv=0;
-    for(int i=0;i<100;i++){
-      //below draws the dots two at a time to keep the 100 dots in the same loop as the bars
-       //smoke[i].draws();
-      dot[i].drawd();
-     }
-    for(g=0,k=0;g<50;g++,k++){
-            //below draws the dots two at a time to keep the 100 dots in the same loop as the bars
-      //below handls the color cycle the decimal is the speed at which theta changes
-       fill(abs(int(127*sin((updatec+(g*0.02)%6.28))+128)),abs(int(127*sin((updatec+((g*0.02)+2)%6.28))+128)),abs(int(127*sin((updatec+((g*0.02)+4)%6.28))+128)));
+    //for(int i=0;i<100;i++){smoke[i].draws();}
+    drawDots();
+    //the bars never use a stroke width so it is set once before the loop
+    strokeWeight(0);
+    //neighbouring bars share two of their three bands so each band is read once per frame
+    //bar g reads bands g+1 to g+3, so the 50 bars need bands 1 to 50+2
+    if(!silent){
+      for(int i=1;i<50+3;i++){level[i]=fft.getBand(bin[i]);}
+    }
+    for(g=0;g<50;g++){
+      //below handls the color cycle, the colors are worked out in barColors()
+       fill(barColor[g]);
      //below is for drawing the abrs
-       strokeWeight(0);
        //  noStroke();
        
-       //bar[g].drawr((18.2378*((0.017453)*atan(10*(((fft.getFreq(freq[g+1])+(2*fft.getFreq(freq[g+2]))+fft.getFreq(freq[g+3]))/4)-0.570896))+0.027416))*10, boom);
-       bar[g].drawr(sqrt(((fft.getFreq(freq[g+1])+(2*fft.getFreq(freq[g+2]))+fft.getFreq(freq[g+3])))/4)*15*((k/25)+0.8), boom);
+       //drawBar(g, (18.2378*((0.017453)*atan(10*(((fft.getFreq(freq[g+1])+(2*fft.getFreq(freq[g+2]))+fft.getFreq(freq[g+3]))/4)-0.570896))+0.027416))*10, boom);
+       float h=0;
+       if(!silent){h=sqrt((level[g+1]+(2*level[g+2])+level[g+3])/4)*scale[g];}
+       drawBar(g, h, boom);
       /*
       //the code below is for drawing a line below the bars with a gradient color in phase with the bar color
        for(int j=0; j<2; j++){
@@ -86,34 +129,30 @@ void draw() {
           stroke(245);
          strokeWeight(3);
          line(65, 246, 765, 246);
-  }
 }
-class dot{
-  
-int divisor;
-float xloc, yloc, diam, delx, dely, trans;
-  
-  dot(){
-  divisor =75;
-  trans= random(100, 255);
-  xloc=random(0, 800);
-  yloc=random(300);
-  diam=(random(1,12));
-  if (diam<7){diam=1;}
-  else if(diam<11){diam=2;}
-  else {diam=3;}
-  delx =(random(1,3)/divisor)*3;
-  dely =((random(0,6)-3)/divisor);
-  }
-  
- void drawd(){fill(245,245,245,int(trans));
-    noStroke();
-    ellipse(int(xloc), int(yloc), int(diam), int(diam));
-    if (xloc > 800){xloc =0;}
-    else {xloc = xloc + delx;}
-    if (yloc > 300){yloc =0;}
-    else if(yloc < 0){yloc = 300;}
-    else {yloc = yloc + dely;}
+//sets up dot i with a random position, drift and transparency, its size comes from its group
+void newDot(int i){
+  int divisor =75;
+  dotc[i]= color(245,245,245,int(random(100, 255)));
+  dotx[i]=random(0, 800);
+  doty[i]=random(300);
+  dotdx[i] =(random(1,3)/divisor)*3;
+  dotdy[i] =((random(0,6)-3)/divisor);
+}
+
+//draws each size group in its own loop so the diameter is fixed for the whole run
+void drawDots(){
+  //none of the dots have an outline, so the stroke only needs to be turned off once
+  noStroke();
+  for(int s=1;s<4;s++){
+    for(int i=dotend[s-1];i<dotend[s];i++){
+      fill(dotc[i]);
+      ellipse(int(dotx[i]), int(doty[i]), s, s);
+      //the dots wrap around the edges of the window, dotdy can be negative so a wrapped y below 0 is moved up by 300
+      dotx[i] = (dotx[i] + dotdx[i]) % 800;
+      doty[i] = (doty[i] + dotdy[i]) % 300;
+      if(doty[i] < 0){doty[i] += 300;}
+    }
   }
 }
 
@@ -147,39 +186,22 @@ float xloc, yloc, diam, delx, dely, trans;
 }
 
 
-class bar{
-  int xloc, yloc, maxh, minh, c;
-  float hn, ho, y;
-  bar(float x, int h, int w){
-  xloc=floor(x);
-  yloc=250;
-  maxh=h;
-  minh=yloc;
-  c=0;
-  ho=0;
+//grows bar i towards target (plus the beat kick) or lets it fall back, then draws it
+void drawBar(int i, float target, int kick){
+  if(target>(barho[i]*2.5)&&barho[i]<barmax){
+    bary[i]=barho[i]+kick;
+    barho[i]=(barho[i]+(0.01*target)+kick);//was 0.01
   }
-void drawr(float hn, int beat){
-  if(hn>(ho*2.5)&&ho<maxh){
-    y=ho+beat;
-   ho=(ho+(0.01*hn)+beat);//was 0.01
-    stroke(0);  
-    rect(xloc, yloc, 11, int(-y));
-    noStroke();
-    ellipse(xloc+6, int(-y)+yloc, 10, 5);
-    stroke(0);
-    }
-  else{ 
-    if(ho<6){
-      ho=6;
-    } 
-    else{      y=(ho); 
-      ho=(ho-(0.015*ho));//was 0.015
-    }
-    stroke(0);
-    rect(xloc, yloc, 11, int(-y));
-    noStroke();
-    ellipse(xloc+6, int(-y)+yloc, 10, 5);
-    stroke(0);}
+  else if(barho[i]<6){
+    barho[i]=6;
   }
-
+  else{
+    bary[i]=barho[i];
+    barho[i]=(barho[i]-(0.015*barho[i]));//was 0.015
+  }
+  stroke(0);
+  rect(barx[i], bary0, 11, int(-bary[i]));
+  noStroke();
+  ellipse(barx[i]+6, int(-bary[i])+bary0, 10, 5);
+  stroke(0);
 }